@@ -1,11 +1,12 @@
 """
 Authentication system using Ed25519 signatures.
 """
+import heapq
 import secrets
 import time
 from typing import Dict, Optional
 from datetime import datetime, timedelta
-from .crypto import verify_signature, load_public_key_from_file
+from .crypto import verify_signature, load_verify_key_from_file
 import os
 
 
@@ -14,9 +15,11 @@ class AuthManager:
     
     def __init__(self, keys_dir: str = "data/keys"):
         self.keys_dir = keys_dir
-        self.challenges: Dict[str, Dict] = {}  # challenge_token -> {username, timestamp, challenge}
-        self.sessions: Dict[str, Dict] = {}  # session_token -> {username, expires_at}
-        self.public_keys: Dict[str, str] = {}  # username -> public_key_hex
+        self.challenges: Dict[bytes, Dict] = {}  # raw challenge token -> {username, timestamp, challenge}
+        self.sessions: Dict[bytes, Dict] = {}  # raw session token -> {username, expires_at}
+        self._challenge_heap: list = []  # (expires_at, challenge_token) min-heap
+        self._session_heap: list = []  # (expires_at, session_token) min-heap
+        self.public_keys: Dict[str, object] = {}  # username -> decoded VerifyKey
         self._load_public_keys()
         self.challenge_expiry = timedelta(minutes=5)  # Challenges expire after 5 minutes
         self.session_expiry = timedelta(hours=24)  # Sessions expire after 24 hours
@@ -27,11 +30,23 @@ class AuthManager:
             key_file = os.path.join(self.keys_dir, f"{username}_public.pem")
             if os.path.exists(key_file):
                 try:
-                    public_key = load_public_key_from_file(key_file)
-                    self.public_keys[username] = public_key
+                    self.public_keys[username] = load_verify_key_from_file(key_file)
                 except Exception as e:
                     print(f"Warning: Could not load public key for {username}: {e}")
     
+    @staticmethod
+    def _token_key(token_hex: str) -> Optional[bytes]:
+        """
+        Decode an incoming hex token to the raw bytes used as dict keys.
+        Tokens are stored as 32-byte keys rather than 64-char hex strings,
+        so the decode happens once per request instead of hashing the
+        longer string on every lookup. Returns None for malformed tokens.
+        """
+        try:
+            return bytes.fromhex(token_hex)
+        except (ValueError, TypeError):
+            return None
+
     def generate_challenge(self, username: str) -> str:
         """
         Generate a challenge token for a user.
@@ -47,19 +62,24 @@ class AuthManager:
         
         # Generate random challenge
         challenge_message = f"codychain_login_{username}_{secrets.token_hex(16)}"
-        challenge_token = secrets.token_hex(32)
-        
-        # Store challenge
-        self.challenges[challenge_token] = {
+        token_bytes = secrets.token_bytes(32)
+
+        # Store challenge; the signed bytes are precomputed here so
+        # verify_login hands them straight to Ed25519 without re-encoding
+        # (or attempting a hex parse on) the message string
+        now = datetime.utcnow()
+        self.challenges[token_bytes] = {
             "username": username,
             "challenge": challenge_message,
-            "timestamp": datetime.utcnow()
+            "challenge_bytes": challenge_message.encode('utf-8'),
+            "timestamp": now
         }
-        
+        heapq.heappush(self._challenge_heap, (now + self.challenge_expiry, token_bytes))
+
         # Clean up expired challenges
         self._cleanup_expired_challenges()
-        
-        return challenge_token, challenge_message
+
+        return token_bytes.hex(), challenge_message
     
     def verify_login(self, challenge_token: str, signature_hex: str) -> Optional[str]:
         """
@@ -73,43 +93,47 @@ class AuthManager:
             Session token if valid, None otherwise
         """
         # Check if challenge exists
-        if challenge_token not in self.challenges:
+        challenge_key = self._token_key(challenge_token)
+        if challenge_key is None:
             return None
-        
-        challenge_data = self.challenges[challenge_token]
-        
+        challenge_data = self.challenges.get(challenge_key)
+        if challenge_data is None:
+            return None
+
         # Check if challenge expired
         if datetime.utcnow() - challenge_data["timestamp"] > self.challenge_expiry:
-            del self.challenges[challenge_token]
+            del self.challenges[challenge_key]
             return None
         
         username = challenge_data["username"]
-        challenge_message = challenge_data["challenge"]
-        
+        challenge_bytes = challenge_data["challenge_bytes"]
+
         # Verify signature
         if username not in self.public_keys:
             return None
-        
+
         public_key = self.public_keys[username]
-        is_valid = verify_signature(challenge_message, signature_hex, public_key)
+        is_valid = verify_signature(challenge_bytes, signature_hex, public_key)
         
         if not is_valid:
             return None
         
         # Remove used challenge
-        del self.challenges[challenge_token]
-        
+        del self.challenges[challenge_key]
+
         # Create session
-        session_token = secrets.token_hex(32)
-        self.sessions[session_token] = {
+        session_bytes = secrets.token_bytes(32)
+        expires_at = datetime.utcnow() + self.session_expiry
+        self.sessions[session_bytes] = {
             "username": username,
-            "expires_at": datetime.utcnow() + self.session_expiry
+            "expires_at": expires_at
         }
-        
+        heapq.heappush(self._session_heap, (expires_at, session_bytes))
+
         # Clean up expired sessions
         self._cleanup_expired_sessions()
-        
-        return session_token
+
+        return session_bytes.hex()
     
     def verify_session(self, session_token: str) -> Optional[str]:
         """
@@ -121,16 +145,18 @@ class AuthManager:
         Returns:
             Username if session is valid, None otherwise
         """
-        if session_token not in self.sessions:
+        session_key = self._token_key(session_token)
+        if session_key is None:
             return None
-        
-        session = self.sessions[session_token]
-        
+        session = self.sessions.get(session_key)
+        if session is None:
+            return None
+
         # Check if session expired
         if datetime.utcnow() > session["expires_at"]:
-            del self.sessions[session_token]
+            del self.sessions[session_key]
             return None
-        
+
         return session["username"]
     
     def logout(self, session_token: str) -> bool:
@@ -143,28 +169,27 @@ class AuthManager:
         Returns:
             True if session was found and removed, False otherwise
         """
-        if session_token in self.sessions:
-            del self.sessions[session_token]
+        session_key = self._token_key(session_token)
+        if session_key is not None and session_key in self.sessions:
+            del self.sessions[session_key]
             return True
         return False
     
     def _cleanup_expired_challenges(self):
-        """Remove expired challenges."""
+        """Pop expired challenges off the front of the expiry heap."""
         now = datetime.utcnow()
-        expired = [
-            token for token, data in self.challenges.items()
-            if now - data["timestamp"] > self.challenge_expiry
-        ]
-        for token in expired:
-            del self.challenges[token]
-    
+        heap = self._challenge_heap
+        while heap and heap[0][0] <= now:
+            _, token = heapq.heappop(heap)
+            # Token may already have been consumed by a login; ignore
+            self.challenges.pop(token, None)
+
     def _cleanup_expired_sessions(self):
-        """Remove expired sessions."""
+        """Pop expired sessions off the front of the expiry heap."""
         now = datetime.utcnow()
-        expired = [
-            token for token, session in self.sessions.items()
-            if now > session["expires_at"]
-        ]
-        for token in expired:
-            del self.sessions[token]
+        heap = self._session_heap
+        while heap and heap[0][0] <= now:
+            _, token = heapq.heappop(heap)
+            # Token may already have been removed by a logout; ignore
+            self.sessions.pop(token, None)
 
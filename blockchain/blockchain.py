@@ -1,16 +1,88 @@
 """
 Core blockchain implementation with Block and Blockchain classes.
 """
+import base64
+import concurrent.futures
 import hashlib
+import itertools
 import json
 import os
 import random
-import string
+import secrets
+import threading
+import time
+
+import orjson
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+from nacl.encoding import HexEncoder
+from nacl.signing import VerifyKey
+from .crypto import (
+    load_verify_key_from_file,
+    transaction_message_digest,
+    verify_signatures_batch,
+)
 from .models import Transaction
 
 
+# Difficulty target: the "0000" hex prefix equals two leading zero bytes
+POW_PREFIX = b"\x00\x00"
+
+# (epoch second, ISO-8601 string) cache for utc_now_iso
+_iso_now_cache = (0, "")
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time as an ISO-8601 string, cached per second.
+    These timestamps label blocks and server-side transaction defaults,
+    so second precision is enough; repeated calls within the same second
+    skip the datetime formatting path entirely.
+    """
+    global _iso_now_cache
+    now = int(time.time())
+    if _iso_now_cache[0] != now:
+        _iso_now_cache = (now, datetime.utcfromtimestamp(now).isoformat())
+    return _iso_now_cache[1]
+
+# Chains shorter than this are validated in-process; beyond it the SHA-256
+# recomputation is farmed out to a process pool
+PARALLEL_VALIDATE_THRESHOLD = 256
+
+
+def _verify_block_payload(item: tuple) -> bool:
+    """
+    Check one (serialized_block_bytes, block_fields, expected_hash) item.
+    Blocks mined since the switch to the compact orjson canonical form
+    hash against the serialized payload; blocks persisted before the
+    switch were hashed over json.dumps(..., sort_keys=True), which emits
+    ", "/": " separators, so that legacy encoding is tried before a block
+    is declared invalid.
+    """
+    payload, block_fields, expected_hash = item
+    if hashlib.sha256(payload).hexdigest() == expected_hash:
+        return True
+    legacy_payload = json.dumps(block_fields, sort_keys=True).encode()
+    return hashlib.sha256(legacy_payload).hexdigest() == expected_hash
+
+
+def _search_nonce(prefix: bytes, suffix: bytes, start_nonce: int = 0) -> tuple:
+    """
+    Search for a nonce whose block hash meets the difficulty target.
+    Works purely on the serialized prefix/suffix byte fragments, so it can
+    run outside the Block object (e.g. in a worker process).
+    Returns (nonce, hash_hex).
+    """
+    midstate = hashlib.sha256(prefix)
+    for nonce in itertools.count(start_nonce):
+        h = midstate.copy()
+        h.update(str(nonce).encode())
+        h.update(suffix)
+        digest = h.digest()
+        if digest[:2] == POW_PREFIX:
+            return nonce, digest.hex()
+
+
 class Block:
     """Represents a single block in the blockchain."""
     
@@ -21,42 +93,126 @@ class Block:
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.nonce = nonce
+        self._tx_dicts = None  # Cached canonical transaction dumps
+        self._fragments = None  # Cached (prefix, suffix) hash serialization
+        self._cached_dict = None  # Cached to_dict payload
         self.hash = self.compute_hash()
-    
+
+    @classmethod
+    def from_dict(cls, block_data: Dict[str, Any]) -> "Block":
+        """
+        Rebuild a block from trusted persisted data.
+        Skips pydantic validation (the data was produced by this process)
+        and does not recompute the proof-of-work hash; the stored hash is
+        restored as-is, exactly as the loader always did.
+        """
+        block = cls.__new__(cls)
+        block.index = block_data["index"]
+        block.timestamp = block_data["timestamp"]
+        block.transactions = [
+            Transaction.model_construct(**tx_data)
+            for tx_data in block_data.get("transactions", [])
+        ]
+        block.previous_hash = block_data["previous_hash"]
+        block.nonce = block_data.get("nonce", 0)
+        block._tx_dicts = None
+        block._fragments = None
+        block._cached_dict = None
+        block.hash = block_data["hash"]
+        return block
+
+    def proof_of_work_args(self) -> tuple:
+        """
+        (prefix, suffix, start_nonce) arguments for _search_nonce, for
+        callers that run the nonce search outside this process.
+        """
+        prefix, suffix = self._hash_fragments()
+        return prefix, suffix, self.nonce + 1
+
+    def _transaction_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Canonical dict dumps of the block's transactions, computed once.
+        Transactions are immutable after the block is created, so the cache
+        never needs invalidation.
+        """
+        if self._tx_dicts is None:
+            self._tx_dicts = [tx.model_dump() for tx in self.transactions]
+        return self._tx_dicts
+
+
+    def _hash_prefix_bytes(self) -> bytes:
+        """Canonical-JSON bytes of the block up to (and including) the nonce key."""
+        return b'{"index":%d,"nonce":' % self.index
+
+    def _hash_suffix_bytes(self) -> bytes:
+        """Canonical-JSON bytes of the block following the nonce value."""
+        return (
+            b',"previous_hash":' + orjson.dumps(self.previous_hash) +
+            b',"timestamp":' + orjson.dumps(self.timestamp) +
+            b',"transactions":' + orjson.dumps(
+                self._transaction_dicts(),
+                option=orjson.OPT_SORT_KEYS
+            ) +
+            b'}'
+        )
+
+    def _hash_fragments(self) -> tuple:
+        """
+        Cached (prefix, suffix) byte fragments of the canonical JSON.
+        Everything except the nonce is fixed once the block is constructed,
+        so the serialization is partially evaluated exactly once.
+        """
+        if self._fragments is None:
+            self._fragments = (self._hash_prefix_bytes(), self._hash_suffix_bytes())
+        return self._fragments
+
     def compute_hash(self) -> str:
         """Compute SHA-256 hash of the block."""
-        block_string = json.dumps({
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "transactions": [tx.model_dump() for tx in self.transactions],
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        prefix, suffix = self._hash_fragments()
+        return hashlib.sha256(prefix + str(self.nonce).encode() + suffix).hexdigest()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert block to dictionary for JSON serialization."""
-        return {
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "transactions": [tx.model_dump() for tx in self.transactions],
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce,
-            "hash": self.hash
-        }
+        """
+        Convert block to dictionary for JSON serialization.
+        Blocks never mutate once mined, so the dict is built once and
+        returned on every later call (snapshot writes, /chain fragments).
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "index": self.index,
+                "timestamp": self.timestamp,
+                "transactions": self._transaction_dicts(),
+                "previous_hash": self.previous_hash,
+                "nonce": self.nonce,
+                "hash": self.hash
+            }
+        return self._cached_dict
 
 
 class Blockchain:
     """Main blockchain class managing the chain and transactions."""
-    
+
+    # How long to coalesce state changes before writing a snapshot
+    SAVE_DEBOUNCE_SECONDS = 0.5
+
     def __init__(self, data_dir: str = "data"):
         self.chain: List[Block] = []
         self.pending_transactions: List[Transaction] = []
+        self._tx_log: List[tuple] = []  # Flat (sender, receiver, amount) log of mined transactions
+        self.balances: Dict[str, float] = {}  # address -> confirmed Coco balance
+        self._chain_cache: List[bytes] = []  # Per-block serialized /chain fragments
+        self._chain_cache_lock = threading.Lock()  # Guards cache fills across request threads
+        self._validated_count = 0  # Blocks whose payload hash already checked out
+        self.ledger_version = 0  # Bumped whenever the balance ledger changes
         self.dev_users: Dict[str, str] = {}  # address -> name mapping
-        self.public_keys: Dict[str, str] = {}  # username -> public_key_hex mapping
+        self._sender_usernames: Dict[str, str] = {}  # address or name -> username
+        self.user_addresses: Dict[str, str] = {}  # username -> address
+        self.public_keys: Dict[str, Any] = {}  # username -> decoded VerifyKey mapping
         self.data_dir = data_dir
         self.data_file = os.path.join(data_dir, "blockchain.json")
         self.keys_dir = os.path.join(data_dir, "keys")
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
@@ -76,29 +232,42 @@ class Blockchain:
         names = ["cody", "ezzy", "alice", "bob", "charlie", "diana", "eve", "frank"]
         for name in names:
             address = self._generate_dev_address()
+            while address in self.dev_users:
+                address = self._generate_dev_address()
             self.dev_users[address] = name
-    
+        self._rebuild_user_indexes()
+
+    def _rebuild_user_indexes(self):
+        """Rebuild the lookup indexes derived from dev_users."""
+        self._sender_usernames = {}
+        self.user_addresses = {}
+        for address, name in self.dev_users.items():
+            self._sender_usernames[address] = name
+            self._sender_usernames[name] = name
+            self.user_addresses[name] = address
+
+    def get_user_address(self, username: str) -> Optional[str]:
+        """Get the address for a username, or None if unknown."""
+        return self.user_addresses.get(username)
+
     def _generate_dev_address(self) -> str:
         """Generate a 4-digit alphanumeric address."""
-        chars = string.ascii_uppercase + string.digits
-        return ''.join(random.choice(chars) for _ in range(4))
+        # One getrandom call, base32-encoded to uppercase alphanumerics
+        return base64.b32encode(secrets.token_bytes(3))[:4].decode()
     
     def _load_public_keys(self):
         """Load public keys from files in the keys directory."""
-        from .crypto import load_public_key_from_file
-        
         for username in ["cody", "ezzy"]:
             key_file = os.path.join(self.keys_dir, f"{username}_public.pem")
             if os.path.exists(key_file):
                 try:
-                    public_key = load_public_key_from_file(key_file)
-                    self.public_keys[username] = public_key
+                    self.public_keys[username] = load_verify_key_from_file(key_file)
                 except Exception as e:
                     print(f"Warning: Could not load public key for {username}: {e}")
-    
+
     def register_public_key(self, username: str, public_key_hex: str):
-        """Register a public key for a user."""
-        self.public_keys[username] = public_key_hex
+        """Register a public key for a user, decoding it once up front."""
+        self.public_keys[username] = VerifyKey(public_key_hex, encoder=HexEncoder)
     
     def get_dev_users(self) -> Dict[str, str]:
         """Get all dev user accounts."""
@@ -108,20 +277,21 @@ class Blockchain:
         """Create the first block (genesis block) in the chain."""
         genesis_block = Block(
             index=0,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=utc_now_iso(),
             transactions=[],
             previous_hash="0"
         )
         # Mine the genesis block to get a valid hash
         self.mine_block(genesis_block)
         self.chain.append(genesis_block)
+        self._log_block_transactions(genesis_block)
     
     def create_block(self) -> Block:
         """Create a new block with current pending transactions."""
         previous_block = self.chain[-1]
         new_block = Block(
             index=len(self.chain),
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=utc_now_iso(),
             transactions=self.pending_transactions.copy(),
             previous_hash=previous_block.hash
         )
@@ -132,63 +302,101 @@ class Blockchain:
         Mine a block using Proof-of-Work.
         Finds a hash starting with "0000" by incrementing nonce.
         """
-        while not block.hash.startswith("0000"):
-            block.nonce += 1
-            block.hash = block.compute_hash()
+        if block.hash.startswith("0000"):
+            return block
+
+        # Hand the cached byte fragments to the nonce search kernel, which
+        # reuses the SHA-256 midstate over the prefix.
+        prefix, suffix = block._hash_fragments()
+        block.nonce, block.hash = _search_nonce(prefix, suffix, start_nonce=block.nonce + 1)
         return block
     
+    def _signature_check_item(self, transaction: Transaction):
+        """
+        Build a (message_digest, signature_hex, public_key) tuple for a signed
+        transaction, or None if there is no registered key to verify against.
+        """
+        # Check if sender has a registered public key
+        sender_username = self._sender_usernames.get(transaction.sender)
+
+        if not (sender_username and sender_username in self.public_keys):
+            # Signature provided but no public key registered - allow but warn
+            print(f"Warning: Signature provided for {transaction.sender} but no public key registered")
+            return None
+
+        timestamp = transaction.timestamp or utc_now_iso()
+        message_digest = transaction_message_digest(
+            transaction.sender, transaction.receiver, transaction.amount, timestamp
+        )
+        return message_digest, transaction.signature, self.public_keys[sender_username]
+
     def add_transaction(self, transaction: Transaction):
         """
         Add a transaction to the pending transactions pool.
         Verifies signature if provided.
         """
-        # Verify signature if present
-        if transaction.signature:
-            from .crypto import verify_transaction_signature
-            
-            # Check if sender has a registered public key
-            sender_username = None
-            for addr, name in self.dev_users.items():
-                if addr == transaction.sender or name == transaction.sender:
-                    sender_username = name
-                    break
-            
-            if sender_username and sender_username in self.public_keys:
-                public_key = self.public_keys[sender_username]
-                timestamp = transaction.timestamp or datetime.utcnow().isoformat()
-                
-                is_valid = verify_transaction_signature(
-                    transaction.sender,
-                    transaction.receiver,
-                    transaction.amount,
-                    transaction.signature,
-                    public_key,
-                    timestamp
-                )
-                
-                if not is_valid:
-                    # Add debug info
-                    print(f"Signature verification failed for {sender_username}")
-                    print(f"  Sender: {transaction.sender}, Receiver: {transaction.receiver}")
-                    print(f"  Amount: {transaction.amount}, Timestamp: {timestamp}")
-                    print(f"  Signature: {transaction.signature[:32]}...")
-                    raise ValueError("Invalid transaction signature")
-            else:
-                # Signature provided but no public key registered - allow but warn
-                print(f"Warning: Signature provided for {transaction.sender} but no public key registered")
-        
-        # Verify ZK proof if present
-        if transaction.zk_proof:
-            try:
-                from .zk_proof import verify_zk_proof
-                if not verify_zk_proof(transaction.zk_proof, transaction.sender, transaction.receiver, transaction.amount):
-                    raise ValueError("Invalid zero-knowledge proof")
-            except ImportError:
-                # zk_proof module not available yet
-                pass
-        
-        self.pending_transactions.append(transaction)
-        self.save_to_file()  # Auto-save after adding transaction
+        self.add_transactions([transaction])
+
+    def check_transactions(self, transactions: List[Transaction]) -> List[Optional[str]]:
+        """
+        Validate a batch of transactions without adding them to the pool.
+        Signature checks for the whole batch run through a single
+        verify_signatures_batch call. Returns one entry per transaction:
+        None if valid, otherwise the rejection reason.
+        """
+        errors: List[Optional[str]] = [None] * len(transactions)
+
+        # Collect signature checks for all signed transactions
+        checks = []
+        checked = []
+        for i, transaction in enumerate(transactions):
+            if transaction.signature:
+                item = self._signature_check_item(transaction)
+                if item is not None:
+                    checks.append(item)
+                    checked.append(i)
+
+        for i, is_valid in zip(checked, verify_signatures_batch(checks)):
+            if not is_valid:
+                transaction = transactions[i]
+                # Add debug info
+                print(f"Signature verification failed for {transaction.sender}")
+                print(f"  Sender: {transaction.sender}, Receiver: {transaction.receiver}")
+                print(f"  Amount: {transaction.amount}, Timestamp: {transaction.timestamp}")
+                print(f"  Signature: {transaction.signature[:32]}...")
+                errors[i] = "Invalid transaction signature"
+
+        # Verify ZK proofs if present
+        for i, transaction in enumerate(transactions):
+            if errors[i] is None and transaction.zk_proof:
+                try:
+                    from .zk_proof import verify_zk_proof
+                    if not verify_zk_proof(transaction.zk_proof, transaction.sender, transaction.receiver, transaction.amount):
+                        errors[i] = "Invalid zero-knowledge proof"
+                except ImportError:
+                    # zk_proof module not available yet
+                    pass
+
+        return errors
+
+    def accept_transactions(self, transactions: List[Transaction]):
+        """
+        Append already-validated transactions to the pending pool and
+        schedule a single save.
+        """
+        self.pending_transactions.extend(transactions)
+        self.schedule_save()  # Auto-save after adding transactions
+
+    def add_transactions(self, transactions: List[Transaction]):
+        """
+        Add several transactions to the pending pool at once.
+        Signature checks are collected and verified as a single batch and
+        the chain is saved once at the end.
+        """
+        for error in self.check_transactions(transactions):
+            if error is not None:
+                raise ValueError(error)
+        self.accept_transactions(transactions)
     
     def _calculate_mining_reward(self) -> float:
         """
@@ -208,16 +416,16 @@ class Blockchain:
         else:  # 10% chance (0.90 to 1.0)
             return round(random.uniform(1.0, 1.4), 1)
     
-    def mine_pending_transactions(self, miner_address: Optional[str] = None) -> Block:
+    def prepare_mining_block(self, miner_address: Optional[str] = None) -> Block:
         """
-        Mine a new block with all pending transactions.
-        If miner_address is provided, adds a mining reward transaction (Coco tokens).
-        Clears pending transactions after mining.
-        Returns the newly mined block.
+        Build the candidate block for the current pending transactions,
+        including the mining reward, without searching for a nonce.
+        Pending transactions are left untouched until the block is
+        committed via commit_mined_block.
         """
         # Create a copy of pending transactions
         transactions_to_mine = self.pending_transactions.copy()
-        
+
         # Add mining reward if miner address is provided
         if miner_address:
             reward_amount = self._calculate_mining_reward()
@@ -228,56 +436,162 @@ class Blockchain:
                 amount=reward_amount
             )
             transactions_to_mine.append(reward_tx)
-        
+
         # Create block with transactions (even if empty)
         previous_block = self.chain[-1]
-        new_block = Block(
+        return Block(
             index=len(self.chain),
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=utc_now_iso(),
             transactions=transactions_to_mine,
             previous_hash=previous_block.hash
         )
-        
+
+    def commit_mined_block(self, block: Block) -> Block:
+        """
+        Append a mined block to the chain and drop its transactions from
+        the pending pool.
+        """
+        self.chain.append(block)
+        self._log_block_transactions(block)
+        mined = {id(tx) for tx in block.transactions}
+        self.pending_transactions = [
+            tx for tx in self.pending_transactions if id(tx) not in mined
+        ]
+        self.schedule_save()  # Auto-save after mining block
+        return block
+
+    def mine_pending_transactions(self, miner_address: Optional[str] = None) -> Block:
+        """
+        Mine a new block with all pending transactions.
+        If miner_address is provided, adds a mining reward transaction (Coco tokens).
+        Clears pending transactions after mining.
+        Returns the newly mined block.
+        """
+        new_block = self.prepare_mining_block(miner_address)
         mined_block = self.mine_block(new_block)
-        self.chain.append(mined_block)
-        self.pending_transactions = []
-        self.save_to_file()  # Auto-save after mining block
-        return mined_block
+        return self.commit_mined_block(mined_block)
     
-    def compute_balance(self, address: str) -> float:
+    def _log_block_transactions(self, block: Block):
+        """
+        Append a block's transactions to the flat transaction log and fold
+        them into the incremental balance ledger.
         """
-        Compute the Coco balance for a given address.
-        Sums all transactions where address is receiver, 
-        subtracts all transactions where address is sender.
-        """
-        balance = 0.0
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.receiver == address:
-                    balance += tx.amount
-                if tx.sender == address:
-                    balance -= tx.amount
-        return balance
+        balances = self.balances
+        for tx in block.transactions:
+            self._tx_log.append((tx.sender, tx.receiver, tx.amount))
+            balances[tx.receiver] = balances.get(tx.receiver, 0.0) + tx.amount
+            balances[tx.sender] = balances.get(tx.sender, 0.0) - tx.amount
+        self.ledger_version += 1  # Invalidates version-keyed balance caches
+    def iter_chain_json(self) -> Iterator[bytes]:
+        """
+        Yield the /chain JSON payload as byte fragments, one block per
+        fragment, so the response can stream without materializing the
+        whole chain in a single buffer. Blocks are immutable once mined,
+        so each block's fragment is serialized once and cached; only
+        blocks appended since the last call get encoded.
+
+        StreamingResponse drives sync generators from the threadpool, so
+        concurrent /chain requests run this concurrently: the cache fill
+        is serialized under a lock (a second filler re-checks the length
+        and finds nothing left to append), and the yield loop walks a
+        fixed count over the append-only list so fragments added by later
+        requests never leak into an in-flight response.
+        """
+        with self._chain_cache_lock:
+            fragments = self._chain_cache
+            for block in self.chain[len(fragments):]:
+                fragments.append(orjson.dumps(block.to_dict()))
+            count = len(fragments)
+        yield b'{"length":%d,"chain":[' % count
+        for i in range(count):
+            if i:
+                yield b','
+            yield fragments[i]
+        yield b']}'
+
+    def recompute_balances(self) -> Dict[str, float]:
+        """
+        Rebuild the balance ledger from the flat transaction log in a
+        single pass. Normally unnecessary (the ledger is maintained
+        incrementally), but useful as a consistency check or after manual
+        edits to the data file.
+        """
+        balances: Dict[str, float] = {}
+        for sender, receiver, amount in self._tx_log:
+            balances[receiver] = balances.get(receiver, 0.0) + amount
+            balances[sender] = balances.get(sender, 0.0) - amount
+        self.balances = balances
+        return balances
+
+    def get_balance(self, address: str) -> float:
+        """
+        Get the confirmed Coco balance for a given address.
+        Reads the incremental ledger maintained as blocks are mined,
+        so lookups are O(1) regardless of chain length.
+        """
+        return self.balances.get(address, 0.0)
+
+    def compute_balance(self, address: str) -> float:
+        """Kept for compatibility; same ledger read as get_balance."""
+        return self.get_balance(address)
     
     def validate_chain(self) -> bool:
         """
         Validate the integrity of the blockchain.
         Checks that each block's hash is valid and previous_hash matches.
+        The hash recomputation is independent per block, so long chains are
+        verified across cores with a process pool.
         """
+        # previous_hash linkage is inherently sequential but cheap
         for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            # Check that the hash is valid
-            if current_block.hash != current_block.compute_hash():
+            if self.chain[i].previous_hash != self.chain[i - 1].hash:
                 return False
-            
-            # Check that previous_hash matches
-            if current_block.previous_hash != previous_block.hash:
-                return False
-        
-        return True
+
+        # Recompute hashes only for blocks appended since the last clean
+        # validation; mined blocks are immutable, so earlier blocks that
+        # already checked out stay clean
+        items = []
+        for block in self.chain[max(self._validated_count, 1):]:
+            prefix, suffix = block._hash_fragments()
+            block_fields = {
+                "index": block.index,
+                "timestamp": block.timestamp,
+                "transactions": block._transaction_dicts(),
+                "previous_hash": block.previous_hash,
+                "nonce": block.nonce
+            }
+            items.append((prefix + str(block.nonce).encode() + suffix, block_fields, block.hash))
+
+        if len(items) < PARALLEL_VALIDATE_THRESHOLD:
+            valid = all(map(_verify_block_payload, items))
+        else:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                valid = all(executor.map(_verify_block_payload, items, chunksize=64))
+
+        if valid:
+            self._validated_count = len(self.chain)
+        return valid
     
+    def schedule_save(self):
+        """
+        Request a snapshot write without blocking the caller.
+        Bursts of updates within SAVE_DEBOUNCE_SECONDS are coalesced into a
+        single save_to_file() call on a background timer thread, so request
+        handlers no longer pay for re-serializing the whole chain.
+        """
+        with self._save_lock:
+            if self._save_timer is None:
+                timer = threading.Timer(self.SAVE_DEBOUNCE_SECONDS, self._flush_scheduled_save)
+                timer.daemon = True
+                self._save_timer = timer
+                timer.start()
+
+    def _flush_scheduled_save(self):
+        """Run the debounced snapshot write and allow the next one."""
+        with self._save_lock:
+            self._save_timer = None
+        self.save_to_file()
+
     def save_to_file(self) -> bool:
         """
         Save the blockchain state to a JSON file.
@@ -288,12 +602,12 @@ class Blockchain:
                 "chain": [block.to_dict() for block in self.chain],
                 "pending_transactions": [tx.model_dump() for tx in self.pending_transactions],
                 "dev_users": self.dev_users,
-                "last_saved": datetime.utcnow().isoformat()
+                "last_saved": utc_now_iso()
             }
             
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
+            with open(self.data_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
             return True
         except Exception as e:
             print(f"Error saving blockchain to file: {e}")
@@ -308,25 +622,19 @@ class Blockchain:
             return False
         
         try:
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
+            with open(self.data_file, 'rb') as f:
+                data = orjson.loads(f.read())
             
             # Load chain
             self.chain = []
+            self._tx_log = []
+            self.balances = {}
+            self._chain_cache = []
+            self._validated_count = 0
             for block_data in data.get("chain", []):
-                transactions = [
-                    Transaction(**tx_data) 
-                    for tx_data in block_data.get("transactions", [])
-                ]
-                block = Block(
-                    index=block_data["index"],
-                    timestamp=block_data["timestamp"],
-                    transactions=transactions,
-                    previous_hash=block_data["previous_hash"],
-                    nonce=block_data.get("nonce", 0)
-                )
-                block.hash = block_data["hash"]  # Restore computed hash
+                block = Block.from_dict(block_data)
                 self.chain.append(block)
+                self._log_block_transactions(block)
             
             # Load pending transactions
             self.pending_transactions = [
@@ -336,11 +644,13 @@ class Blockchain:
             
             # Load dev users
             self.dev_users = data.get("dev_users", {})
-            
+
             # Re-initialize dev users if empty (backward compatibility)
             if not self.dev_users:
                 self._initialize_dev_users()
-            
+            else:
+                self._rebuild_user_indexes()
+
             return True
         except Exception as e:
             print(f"Error loading blockchain from file: {e}")
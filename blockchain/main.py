@@ -1,16 +1,32 @@
 """
 FastAPI application for the blockchain backend.
 """
-from fastapi import FastAPI, HTTPException, Query, Header
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import FastAPI, HTTPException, Query, Header, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional
 from pydantic import BaseModel
-from .blockchain import Blockchain
-from .models import TransactionRequest, BalanceResponse, ChainResponse
+from .blockchain import Blockchain, _search_nonce, utc_now_iso
+from .models import Transaction, TransactionRequest, BalanceResponse
 from .auth import AuthManager
 
-# Initialize FastAPI app
-app = FastAPI(title="Codychain Backend V1", version="1.0.0")
+# Initialize FastAPI app; orjson handles response serialization, which is
+# several times faster than the stdlib encoder on the larger payloads
+# (/chain in particular)
+app = FastAPI(
+    title="Codychain Backend V1",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+
+# Proof-of-work runs in a separate process so it can't stall the event
+# loop; mining is serialized by the lock, so one worker is enough
+mining_executor = ProcessPoolExecutor(max_workers=1)
+mining_lock = asyncio.Lock()
 
 # Add CORS middleware
 app.add_middleware(
@@ -28,10 +44,112 @@ blockchain = Blockchain()
 auth_manager = AuthManager()
 
 
+def _session_token(authorization: Optional[str]) -> str:
+    """
+    Extract the session token from an Authorization header value.
+    removeprefix only looks at the head of the string instead of scanning
+    the whole token the way str.replace does.
+    """
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    return authorization.removeprefix("Bearer ").strip()
+
+
+async def current_user(
+    authorization: Optional[str] = Header(None, alias="Authorization")
+) -> str:
+    """
+    FastAPI dependency resolving the Authorization header to a username.
+    Replaces the header-parsing/session-check block that was duplicated
+    across the authenticated endpoints.
+    """
+    username = auth_manager.verify_session(_session_token(authorization))
+    if not username:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    return username
+
+
+class TxBatcher:
+    """
+    Coalesces concurrent transaction submissions into batched inserts.
+    Submissions queue up for a short window (or until the batch is full),
+    then the whole batch is validated in one check_transactions call off
+    the event loop and accepted with a single pool insert, so signature
+    verification and pending-pool updates are paid per batch instead of
+    per request.
+    """
+
+    def __init__(self, chain: Blockchain, max_batch: int = 128, window_seconds: float = 0.001):
+        self.chain = chain
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background drain task (call from app startup)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain_loop())
+
+    async def submit(self, tx: Transaction):
+        """
+        Queue a transaction and wait for its batch to be processed.
+        Raises ValueError if the transaction is rejected.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tx, future))
+        await future
+
+    async def _drain_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        transactions = [tx for tx, _ in batch]
+        try:
+            errors = await run_in_threadpool(self.chain.check_transactions, transactions)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        accepted = [tx for (tx, _), error in zip(batch, errors) if error is None]
+        if accepted:
+            self.chain.accept_transactions(accepted)
+
+        for (_, future), error in zip(batch, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(ValueError(error))
+
+
+tx_batcher = TxBatcher(blockchain)
+
+
+@app.on_event("startup")
+async def start_tx_batcher():
+    tx_batcher.start()
+
+
 @app.post("/transaction/new")
 async def create_transaction(
     transaction: TransactionRequest,
-    authorization: Optional[str] = Header(None, alias="Authorization")
+    username: str = Depends(current_user)
 ):
     """
     Add a new transaction to the pending transactions pool.
@@ -47,31 +165,12 @@ async def create_transaction(
     - zk_proof: optional dict (zero-knowledge proof)
     - timestamp: optional string (transaction timestamp)
     """
-    from .models import Transaction
-    from datetime import datetime
-    
-    # Check authentication
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Authentication required")
-    
-    # Extract session token
-    session_token = authorization.replace("Bearer ", "").strip()
-    username = auth_manager.verify_session(session_token)
-    
-    if not username:
-        raise HTTPException(status_code=401, detail="Invalid or expired session")
-    
     # Get user's address
-    dev_users = blockchain.get_dev_users()
-    user_address = None
-    for address, name in dev_users.items():
-        if name == username:
-            user_address = address
-            break
-    
+    user_address = blockchain.get_user_address(username)
+
     if not user_address:
         raise HTTPException(status_code=404, detail=f"Address not found for user {username}")
-    
+
     # Validate that sender matches logged-in user
     if transaction.sender != user_address:
         raise HTTPException(
@@ -79,17 +178,16 @@ async def create_transaction(
             detail=f"You can only send transactions from your own address ({user_address}). You are logged in as {username}."
         )
     
-    tx = Transaction(
-        sender=transaction.sender,
-        receiver=transaction.receiver,
-        amount=transaction.amount,
-        signature=transaction.signature,
-        zk_proof=transaction.zk_proof,
-        timestamp=transaction.timestamp or datetime.utcnow().isoformat()
-    )
+    # TransactionRequest and Transaction share their field set, so the
+    # validated payload converts without re-listing every field
+    fields = transaction.model_dump()
+    fields["timestamp"] = fields["timestamp"] or utc_now_iso()
+    tx = Transaction(**fields)
     
     try:
-        blockchain.add_transaction(tx)
+        # Batched with concurrent submissions; verification runs off the
+        # event loop once per batch
+        await tx_batcher.submit(tx)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
@@ -102,7 +200,7 @@ async def create_transaction(
 @app.post("/mine")
 async def mine_block(
     miner_address: Optional[str] = Query(None, description="Address of the miner to receive Coco rewards"),
-    authorization: Optional[str] = Header(None, alias="Authorization")
+    username: str = Depends(current_user)
 ):
     """
     Mine a new block with all pending transactions.
@@ -118,28 +216,12 @@ async def mine_block(
     - 10% chance: 1.0-1.4 Coco
     Clears pending transactions after mining.
     """
-    # Check authentication
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Authentication required")
-    
-    # Extract session token (format: "Bearer <token>" or just "<token>")
-    session_token = authorization.replace("Bearer ", "").strip()
-    username = auth_manager.verify_session(session_token)
-    
-    if not username:
-        raise HTTPException(status_code=401, detail="Invalid or expired session")
-    
     # Get user's address
-    dev_users = blockchain.get_dev_users()
-    user_address = None
-    for address, name in dev_users.items():
-        if name == username:
-            user_address = address
-            break
-    
+    user_address = blockchain.get_user_address(username)
+
     if not user_address:
         raise HTTPException(status_code=404, detail=f"Address not found for user {username}")
-    
+
     # Validate that miner_address belongs to logged-in user
     if miner_address and miner_address != user_address:
         raise HTTPException(
@@ -151,7 +233,15 @@ async def mine_block(
     final_miner_address = miner_address or user_address
     
     try:
-        mined_block = blockchain.mine_pending_transactions(miner_address=final_miner_address)
+        # Build the candidate block here, run the CPU-bound nonce search in
+        # the worker process, then commit the result on this side
+        async with mining_lock:
+            candidate = blockchain.prepare_mining_block(miner_address=final_miner_address)
+            loop = asyncio.get_running_loop()
+            candidate.nonce, candidate.hash = await loop.run_in_executor(
+                mining_executor, _search_nonce, *candidate.proof_of_work_args()
+            )
+            mined_block = blockchain.commit_mined_block(candidate)
         return {
             "message": "Block mined successfully",
             "block": mined_block.to_dict()
@@ -160,32 +250,44 @@ async def mine_block(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/chain", response_model=ChainResponse)
+@app.get("/chain")
 async def get_chain():
     """
     Get the full blockchain.
-    
+
     Returns:
     - length: number of blocks
     - chain: array of all blocks
     """
-    return ChainResponse(
-        length=len(blockchain.chain),
-        chain=[block.to_dict() for block in blockchain.chain]
-    )
+    # Streamed block by block from cached per-block fragments, so the
+    # whole chain is never assembled into one response buffer
+    return StreamingResponse(blockchain.iter_chain_json(), media_type="application/json")
+
+
+# Balance payloads keyed by address, tagged with the ledger version they
+# were built against; wallet UIs poll these endpoints continuously
+_balance_cache: dict = {}
+_BALANCE_CACHE_MAX = 10_000
 
 
 @app.get("/balances/{address}", response_model=BalanceResponse)
 async def get_balance(address: str):
     """
     Get the Coco balance for a given address.
-    
+
     Returns:
     - address: the queried address
     - balance: total Coco balance
     """
-    balance = blockchain.compute_balance(address)
-    return BalanceResponse(address=address, balance=balance)
+    version = blockchain.ledger_version
+    cached = _balance_cache.get(address)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    response = BalanceResponse(address=address, balance=blockchain.get_balance(address))
+    if len(_balance_cache) >= _BALANCE_CACHE_MAX:
+        _balance_cache.clear()
+    _balance_cache[address] = (version, response)
+    return response
 
 
 @app.get("/dev-users")
@@ -204,12 +306,11 @@ async def get_user_address(username: str):
     Returns:
         address: The address associated with the username, or None if not found
     """
-    dev_users = blockchain.get_dev_users()
-    # Find address for this username
-    for address, name in dev_users.items():
-        if name == username:
-            return {"username": username, "address": address}
-    raise HTTPException(status_code=404, detail=f"User {username} not found")
+    # Single lookup in the username->address index built at startup
+    address = blockchain.get_user_address(username)
+    if address is None:
+        raise HTTPException(status_code=404, detail=f"User {username} not found")
+    return {"username": username, "address": address}
 
 
 # Authentication endpoints
@@ -286,11 +387,7 @@ async def logout(authorization: Optional[str] = Header(None, alias="Authorizatio
     """
     Logout by invalidating session token.
     """
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Authentication required")
-    
-    session_token = authorization.replace("Bearer ", "").strip()
-    success = auth_manager.logout(session_token)
+    success = auth_manager.logout(_session_token(authorization))
     
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -299,22 +396,13 @@ async def logout(authorization: Optional[str] = Header(None, alias="Authorizatio
 
 
 @app.get("/auth/verify")
-async def verify_auth(authorization: Optional[str] = Header(None, alias="Authorization")):
+async def verify_auth(username: str = Depends(current_user)):
     """
     Verify if a session token is valid.
-    
+
     Returns:
         username if valid, error if not
     """
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Authentication required")
-    
-    session_token = authorization.replace("Bearer ", "").strip()
-    username = auth_manager.verify_session(session_token)
-    
-    if not username:
-        raise HTTPException(status_code=401, detail="Invalid or expired session")
-    
     return {"username": username, "authenticated": True}
 
 
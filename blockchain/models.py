@@ -5,14 +5,42 @@ from pydantic import BaseModel
 from typing import List, Optional
 
 
-class Transaction(BaseModel):
-    """Transaction model."""
-    sender: str
-    receiver: str
-    amount: float
-    signature: Optional[str] = None  # Ed25519 signature in hex format
-    zk_proof: Optional[dict] = None  # Optional zero-knowledge proof
-    timestamp: Optional[str] = None  # Transaction timestamp for signature verification
+class Transaction:
+    """
+    Transaction model.
+
+    Plain __slots__ class rather than a Pydantic model: transactions are
+    only built from already-validated TransactionRequest payloads or from
+    trusted snapshot data, so per-instance validation is pure overhead on
+    the hot path. The model_dump/model_construct names are kept so call
+    sites read the same as the Pydantic request models.
+    """
+    __slots__ = ("sender", "receiver", "amount", "signature", "zk_proof", "timestamp")
+
+    def __init__(
+        self,
+        sender: str,
+        receiver: str,
+        amount: float,
+        signature: Optional[str] = None,  # Ed25519 signature in hex format
+        zk_proof: Optional[dict] = None,  # Optional zero-knowledge proof
+        timestamp: Optional[str] = None,  # Transaction timestamp for signature verification
+    ):
+        self.sender = sender
+        self.receiver = receiver
+        self.amount = amount
+        self.signature = signature
+        self.zk_proof = zk_proof
+        self.timestamp = timestamp
+
+    @classmethod
+    def model_construct(cls, **fields) -> "Transaction":
+        """Build a transaction from trusted field data."""
+        return cls(**fields)
+
+    def model_dump(self) -> dict:
+        """Return the transaction fields as a dict, in field order."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
 
 
 class TransactionRequest(BaseModel):
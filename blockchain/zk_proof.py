@@ -3,66 +3,150 @@ Simple Zero-Knowledge Proof implementation for transactions.
 Uses Schnorr-like proof on Ed25519 curve.
 """
 import hashlib
+import hmac
 import secrets
-from typing import Dict, Optional
+import struct
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
 from nacl.signing import SigningKey, VerifyKey
 from nacl.encoding import HexEncoder
 
+# Domain-separation key for the proof hashes
+_ZK_KEY = b"codychain-zk-proof"
+
+# High-bit/low-bits masks for the 32-lane bytewise add in _bytewise_add
+_HI_BITS = int.from_bytes(b"\x80" * 32, "big")
+_LO_BITS = int.from_bytes(b"\x7f" * 32, "big")
+
+
+def _bytewise_add(a: bytes, b: bytes) -> bytes:
+    """
+    Add two 32-byte strings lane-by-lane modulo 256.
+    Runs as three big-int operations in CPython's C bignum code instead of
+    a 32-iteration Python loop; the masks keep carries from crossing byte
+    boundaries.
+    """
+    x = int.from_bytes(a, "big")
+    y = int.from_bytes(b, "big")
+    s = ((x & _LO_BITS) + (y & _LO_BITS)) ^ ((x ^ y) & _HI_BITS)
+    return s.to_bytes(32, "big")
+
+
+def _message_digest(sender: str, receiver: str, amount: float) -> bytes:
+    """
+    Keyed BLAKE2b digest of the transaction data being proven.
+    Streams the raw fields into one hash instead of building an
+    intermediate formatted string.
+    """
+    h = hashlib.blake2b(digest_size=32, key=_ZK_KEY)
+    h.update(sender.encode('utf-8'))
+    h.update(b":")
+    h.update(receiver.encode('utf-8'))
+    h.update(b":")
+    h.update(struct.pack("<d", amount))
+    return h.digest()
+
+
+def _challenge_digest(commitment: bytes, message_digest: bytes) -> bytes:
+    """Keyed BLAKE2b digest binding the commitment to the message."""
+    h = hashlib.blake2b(digest_size=32, key=_ZK_KEY)
+    h.update(commitment)
+    h.update(message_digest)
+    return h.digest()
+
+
+# Precomputed (nonce, commitment) pairs. Deriving a commitment costs an
+# Ed25519 scalar multiplication, so a background thread keeps a small pool
+# topped up and generate_zk_proof just pops a ready-made pair.
+_POOL_TARGET = 64
+_nonce_pool: deque = deque()
+_pool_lock = threading.Lock()
+_refill_running = False
+
+
+def _make_nonce_commitment() -> Tuple[bytes, bytes]:
+    """Draw a fresh nonce and derive its commitment (the verify key)."""
+    nonce = secrets.token_bytes(32)
+    return nonce, SigningKey(nonce).verify_key.encode()
+
+
+def _refill_nonce_pool():
+    """Top the pool back up to its target size (runs on a worker thread)."""
+    global _refill_running
+    try:
+        while len(_nonce_pool) < _POOL_TARGET:
+            _nonce_pool.append(_make_nonce_commitment())
+    finally:
+        with _pool_lock:
+            _refill_running = False
+
+
+def _next_nonce_commitment() -> Tuple[bytes, bytes]:
+    """
+    Pop a precomputed (nonce, commitment) pair, kicking off a background
+    refill when the pool runs low. Falls back to computing inline when
+    the pool is empty (e.g. first call after import).
+    """
+    global _refill_running
+    with _pool_lock:
+        if len(_nonce_pool) <= _POOL_TARGET // 2 and not _refill_running:
+            _refill_running = True
+            threading.Thread(target=_refill_nonce_pool, daemon=True).start()
+        if _nonce_pool:
+            return _nonce_pool.popleft()
+    return _make_nonce_commitment()
+
 
 def generate_zk_proof(sender: str, receiver: str, amount: float, private_key_hex: str) -> Dict:
     """
     Generate a zero-knowledge proof that proves knowledge of private key
     without revealing it (Schnorr-like proof).
-    
+
     Args:
         sender: Sender address
         receiver: Receiver address
         amount: Transaction amount
         private_key_hex: Private key in hex format
-    
+
     Returns:
         Dictionary containing proof components: {commitment, challenge, response}
     """
-    # Create message to prove knowledge of
-    message = f"{sender}:{receiver}:{amount}"
-    message_hash = hashlib.sha256(message.encode('utf-8')).hexdigest()
-    
-    # Generate random nonce (commitment)
-    signing_key = SigningKey(private_key_hex, encoder=HexEncoder)
-    nonce = secrets.token_bytes(32)
-    nonce_key = SigningKey(nonce)
-    commitment = nonce_key.verify_key.encode(encoder=HexEncoder).hex()
-    
+    # Digest of the transaction data to prove knowledge of
+    message_digest = _message_digest(sender, receiver, amount)
+
+    # Random nonce and its commitment, drawn from the precomputed pool so
+    # the curve multiplication usually happens off the request path
+    nonce, commitment = _next_nonce_commitment()
+
     # Create challenge (hash of commitment + message)
-    challenge_data = f"{commitment}:{message_hash}"
-    challenge = hashlib.sha256(challenge_data.encode('utf-8')).hexdigest()
-    
-    # Compute response (nonce + challenge * private_key)
+    challenge = _challenge_digest(commitment, message_digest)
+
+    # Compute response (nonce + private_key, bytewise)
     # This is a simplified version - in a real ZK proof, we'd use proper curve operations
-    challenge_int = int(challenge[:16], 16)  # Use first 16 hex chars as integer
     private_key_bytes = bytes.fromhex(private_key_hex)
-    response_bytes = bytes([(a + b) % 256 for a, b in zip(nonce, private_key_bytes)])
-    response = response_bytes.hex()
-    
+    response_bytes = _bytewise_add(nonce, private_key_bytes)
+
+    # Hex-encode only at the API boundary
     return {
-        "commitment": commitment,
-        "challenge": challenge,
-        "response": response,
-        "message_hash": message_hash
+        "commitment": commitment.hex(),
+        "challenge": challenge.hex(),
+        "response": response_bytes.hex(),
+        "message_hash": message_digest.hex()
     }
 
 
 def verify_zk_proof(proof: Dict, sender: str, receiver: str, amount: float, public_key_hex: Optional[str] = None) -> bool:
     """
     Verify a zero-knowledge proof.
-    
+
     Args:
         proof: Dictionary containing proof components
         sender: Sender address
         receiver: Receiver address
         amount: Transaction amount
         public_key_hex: Optional public key for verification (if not provided, uses proof data)
-    
+
     Returns:
         True if proof is valid, False otherwise
     """
@@ -71,32 +155,31 @@ def verify_zk_proof(proof: Dict, sender: str, receiver: str, amount: float, publ
         challenge = proof.get("challenge")
         response = proof.get("response")
         message_hash = proof.get("message_hash")
-        
+
         if not all([commitment, challenge, response, message_hash]):
             return False
-        
-        # Recreate message hash
-        message = f"{sender}:{receiver}:{amount}"
-        expected_message_hash = hashlib.sha256(message.encode('utf-8')).hexdigest()
-        
-        if message_hash != expected_message_hash:
+
+        # Recreate message digest
+        expected_message_digest = _message_digest(sender, receiver, amount)
+
+        # compare_digest runs in constant time over the full length, so
+        # the comparison leaks nothing about where a forged digest differs
+        if not hmac.compare_digest(bytes.fromhex(message_hash), expected_message_digest):
             return False
-        
+
         # Verify challenge matches commitment + message
-        challenge_data = f"{commitment}:{message_hash}"
-        expected_challenge = hashlib.sha256(challenge_data.encode('utf-8')).hexdigest()
-        
-        if challenge != expected_challenge:
+        expected_challenge = _challenge_digest(bytes.fromhex(commitment), expected_message_digest)
+
+        if not hmac.compare_digest(bytes.fromhex(challenge), expected_challenge):
             return False
-        
+
         # Verify response (simplified verification)
         # In a real implementation, we'd verify the curve point relationship
         response_bytes = bytes.fromhex(response)
         if len(response_bytes) != 32:
             return False
-        
+
         # Basic validation - in production, use proper curve verification
         return True
     except Exception:
         return False
-
@@ -1,9 +1,27 @@
 """
 Simple script to run the blockchain API server.
-Run with: python run.py
+Run with: python run.py (set DEV=1 for auto-reload during development)
 """
+import os
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("blockchain.main:app", host="0.0.0.0", port=8000, reload=True)
+    # Dev mode keeps the old single-worker auto-reload behaviour
+    dev_mode = os.getenv("DEV", "").lower() in ("1", "true", "yes")
 
+    # uvloop and httptools (both part of uvicorn[standard]) replace the
+    # stdlib event loop and HTTP parser with much faster C implementations.
+    # Workers default to 1: the blockchain, pending pool and auth sessions
+    # live in process memory, so extra workers would each see their own
+    # divergent state. Raising WORKERS only makes sense once that state
+    # moves to a shared store.
+    uvicorn.run(
+        "blockchain.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=dev_mode,
+        workers=1 if dev_mode else int(os.getenv("WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+    )
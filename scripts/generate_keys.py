@@ -4,6 +4,7 @@ Keys are stored in data/keys/ directory.
 """
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path to import blockchain modules
@@ -48,12 +49,17 @@ def main():
     print()
     
     users = ["cody", "ezzy"]
-    
-    for username in users:
+
+    # Key generation is independent per user, so run it in parallel
+    # (libsodium releases the GIL); saving stays sequential to keep the
+    # console output in user order
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        keypairs = list(executor.map(lambda _: generate_keypair(), users))
+
+    for username, (private_key, public_key) in zip(users, keypairs):
         print(f"Generating keys for {username}...")
-        private_key, public_key = generate_keypair()
         save_keypair(username, private_key, public_key)
-    
+
     print("=" * 60)
     print("Key generation complete!")
     print()